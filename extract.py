@@ -1,6 +1,31 @@
 import gdstk
 import os
 import json
+from filecache import file_stamp
+
+# loaded libraries and tech files, keyed by file path
+# entries are dropped when the file's mtime or size changes
+_gds_cache = {}
+_tech_cache = {}
+
+def load_gds(gds_path):
+    stamp = file_stamp(gds_path)
+    cached = _gds_cache.get(gds_path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    lib = gdstk.read_gds(gds_path)
+    _gds_cache[gds_path] = (stamp, lib)
+    return lib
+
+def load_tech(tech_path):
+    stamp = file_stamp(tech_path)
+    cached = _tech_cache.get(tech_path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    with open(tech_path, "r") as f:
+        tech = json.load(f)
+    _tech_cache[tech_path] = (stamp, tech)
+    return tech
 
 def is_valid_polygon(poly):
     try:
@@ -10,8 +35,7 @@ def is_valid_polygon(poly):
         return False
 
 def find_transistors_by_bounding_box(library, tech):
-    with open(tech, "r") as f:
-        jsonTech = json.load(f)
+    jsonTech = load_tech(tech)
 
     POLY_LAYER, POLY_DATATYPE = jsonTech["ls"]["POLY"]["layer"], jsonTech["ls"]["POLY"]["datatype"]
     DIFF_LAYER, DIFF_DATATYPE = jsonTech["ls"]["DIFF"]["layer"], jsonTech["ls"]["DIFF"]["datatype"]
@@ -209,8 +233,7 @@ def transpile_to_netlist_and_save(extraction_result, tech_path, output_filename)
         return
 
     try:
-        with open(tech_path, "r") as f:
-            tech = json.load(f)
+        tech = load_tech(tech_path)
 
         port_lines = []
         for direction, ports in tech.items():
@@ -377,7 +400,7 @@ def extract(gds_path, tech_path, output_path):
         return
 
     try:
-        lib = gdstk.read_gds(gds_path)
+        lib = load_gds(gds_path)
         print(f"Loaded GDSII file: {gds_path}")
         nmos_transistors, pmos_transistors = find_transistors_by_bounding_box(lib, tech_path)
         all_transistors = nmos_transistors + pmos_transistors
@@ -416,9 +439,8 @@ def extractMain(gds_path, tech_path, output_path):
     tech_file = tech_path
     netlist_output = output_path
     print(gds_file, tech_file, netlist_output)
-    lib = gdstk.read_gds(gds_file)
-    with open(tech_file, "r") as f:
-        tech = json.load(f)
+    lib = load_gds(gds_file)
+    tech = load_tech(tech_file)
 
     met1_info = tech["ls"]["MET1"]
 
@@ -432,6 +454,7 @@ def extractMain(gds_path, tech_path, output_path):
 
     if extraction_result is None:
         print("Extraction failed or no transistors found.")
+        return False
     else:
         all_transistors = extraction_result["nmos_transistors"] + extraction_result["pmos_transistors"]
 
@@ -446,4 +469,5 @@ def extractMain(gds_path, tech_path, output_path):
                 print(f"  Ports: {', '.join(conn['ports'])}")
             else:
                 print("  Ports: None")
-        write_cmos_netlist(metal_net_connections, all_transistors, tech, netlist_output)
\ No newline at end of file
+        write_cmos_netlist(metal_net_connections, all_transistors, tech, netlist_output)
+        return True
\ No newline at end of file
@@ -0,0 +1,6 @@
+import os
+
+# caches compare this stamp on every access and reload when it changes
+def file_stamp(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
@@ -0,0 +1,151 @@
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import sys
+import threading
+from extract import extractMain
+from filecache import file_stamp
+from simulate import graboutputs, grabinputs, simulate_circuit, truth_table
+
+# requests share the module caches and redirect stdout, so run one at a time
+_request_lock = threading.Lock()
+
+# extracted netlists, keyed by (gds, tech, output) path
+# an entry is reused while all three files still match their recorded stamps
+_extract_cache = {}
+
+def handle_extract(request):
+    gds_file = request.get("gds")
+    tech_file = request.get("tech")
+    output_file = request.get("output", "netlist.cmos")
+    if not gds_file or not tech_file:
+        raise ValueError("extract requires 'gds' and 'tech'")
+
+    gds_path = os.path.join("layout", gds_file)
+    tech_path = os.path.join("tech", tech_file)
+    output_path = os.path.join("output", output_file)
+    if not os.path.isfile(gds_path):
+        raise FileNotFoundError(f"{gds_file} not found in 'layout/' folder.")
+    if not os.path.isfile(tech_path):
+        raise FileNotFoundError(f"{tech_file} not found in 'tech/' folder.")
+
+    key = (gds_path, tech_path, output_path)
+    stamps = (file_stamp(gds_path), file_stamp(tech_path))
+    cached = _extract_cache.get(key)
+    if cached is not None and cached[0] == stamps and os.path.isfile(output_path) and file_stamp(output_path) == cached[1]:
+        return {"output": output_path, "cached": True, "log": cached[2]}
+
+    # whatever is on disk now no longer matches, even if this run fails
+    _extract_cache.pop(key, None)
+
+    os.makedirs("output", exist_ok=True)
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        ok = extractMain(gds_path, tech_path, output_path)
+    if not ok:
+        errors = [line for line in log.getvalue().splitlines() if line.startswith("Error")]
+        raise RuntimeError("; ".join(errors + ["Extraction failed or no transistors found."]))
+    _extract_cache[key] = (stamps, file_stamp(output_path), log.getvalue())
+    return {"output": output_path, "cached": False, "log": log.getvalue()}
+
+def handle_simulate(request):
+    netlist_file = request.get("netlist")
+    if not netlist_file:
+        raise ValueError("simulate requires 'netlist'")
+
+    netlist_path = os.path.join("output", netlist_file)
+    if not os.path.isfile(netlist_path):
+        raise FileNotFoundError(f"{netlist_file} not found in 'output/' folder.")
+
+    filename = os.path.splitext(netlist_path)[0]
+    portinputs = grabinputs(filename)
+    portoutputs = graboutputs(filename)
+    response = {"inputs": portinputs, "outputs": portoutputs}
+
+    # no input values means the whole truth table
+    values = request.get("values")
+    if values is None:
+        if len(portinputs) > 6:
+            raise ValueError("too many inputs to generate truth table")
+        response["table"] = truth_table(filename)
+    else:
+        if not isinstance(values, dict) or set(values) != set(portinputs):
+            raise ValueError(f"'values' must be an object with exactly the inputs {', '.join(portinputs)}")
+        if any(type(v) is not int or v not in (0, 1) for v in values.values()):
+            raise ValueError("all inputs must be 0 or 1")
+        response["result"] = simulate_circuit(filename, values)
+    return response
+
+HANDLERS = {
+    "extract": handle_extract,
+    "simulate": handle_simulate,
+}
+
+def handle_request(line):
+    request_id = None
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError("request must be a JSON object")
+        request_id = request.get("id")
+        handler = HANDLERS.get(request.get("mode"))
+        if handler is None:
+            raise ValueError(f"unknown mode: {request.get('mode')}")
+        with _request_lock:
+            response = handler(request)
+        response["ok"] = True
+    except Exception as e:
+        response = {"ok": False, "error": str(e)}
+    if request_id is not None:
+        response["id"] = request_id
+    return json.dumps(response)
+
+def serve_stdio():
+    # one JSON request per line on stdin, one JSON response per line on stdout
+    for line in sys.stdin:
+        if line.strip():
+            print(handle_request(line), flush=True)
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if line.strip():
+                self.wfile.write((handle_request(line) + "\n").encode())
+                self.wfile.flush()
+
+class SocketServer(socketserver.ThreadingUnixStreamServer):
+    # idle clients must not keep the server alive once it is told to stop
+    daemon_threads = True
+    block_on_close = False
+
+def stop_server(signum, frame):
+    raise KeyboardInterrupt
+
+def serve_socket(socket_path):
+    # clear a stale socket left by a previous server, but never a regular file
+    # or the socket of a server that is still running
+    if os.path.exists(socket_path) and stat.S_ISSOCK(os.stat(socket_path).st_mode):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(socket_path)
+            except ConnectionRefusedError:
+                os.remove(socket_path)
+            else:
+                print(f"Error: {socket_path} is already in use by a running server.", file=sys.stderr)
+                sys.exit(1)
+    # stop on SIGTERM the same way as on Ctrl+C so the socket is cleaned up
+    signal.signal(signal.SIGTERM, stop_server)
+    with SocketServer(socket_path, RequestHandler) as server:
+        print(f"Listening on {socket_path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(socket_path)
@@ -4,6 +4,7 @@ import os
 import sys
 from extract import extractMain
 from simulate import simulate
+from server import serve_socket, serve_stdio
 
 def convert_to_routing_netlist(gds_file, tech_file, output_file):
     # check if input files exist in expected folders
@@ -46,12 +47,12 @@ def main():
     parser.add_argument(
         "-m", "--mode",
         required=True,
-        choices=["extract", "simulate"],
-        help="Mode of operation: extract or simulate"
+        choices=["extract", "simulate", "serve"],
+        help="Mode of operation: extract, simulate or serve"
     )
     parser.add_argument(
         "inputs",
-        nargs="+",
+        nargs="*",
         help="Input files (extract: <layout.gds> <tech.json>, simulate: <netlist.cmos>)"
     )
     parser.add_argument(
@@ -59,6 +60,10 @@ def main():
         default="netlist.cmos",
         help="Output netlist file name (only for extract mode) (extract: <layout.gds> <tech.json> -o <example.cmos>)"
     )
+    parser.add_argument(
+        "-s", "--socket",
+        help="Unix socket path to listen on (only for serve mode, reads JSON lines from stdin if omitted)"
+    )
 
     args = parser.parse_args()
 
@@ -74,5 +79,13 @@ def main():
         netlist_file = args.inputs[0]
         simulate_netlist(netlist_file)
 
+    elif args.mode == "serve":
+        if args.inputs:
+            parser.error("serve mode takes no input files")
+        if args.socket:
+            serve_socket(args.socket)
+        else:
+            serve_stdio()
+
 if __name__ == "__main__":
     main()
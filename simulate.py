@@ -1,39 +1,54 @@
 from itertools import product
 import os
+from filecache import file_stamp
+
+# parsed netlists and compiled evaluation orders, keyed by file path
+# entries are dropped when the file's mtime or size changes
+_netlist_cache = {}
+_compiled_cache = {}
+
+def read_netlist(filename):
+    path = filename+".cmos"
+    stamp = file_stamp(path)
+    cached = _netlist_cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
 
-def grabinputs(filename):
     result = []
-    with open(filename+".cmos", 'r') as file:
+    with open(path, 'r') as file:
         for line in file:
             stripped = line.strip()
             if stripped:
                 result.append(stripped.split())
     result.sort(key=lambda x: x[0])
+    _netlist_cache[path] = (stamp, result)
+    return result
+
+def grabinputs(filename):
+    result = read_netlist(filename)
     port = list(filter(lambda x: x[0] == 'PORT', result))
     portinputs = [x[2] for x in port if x[1] == 'IN' and x[2] not in ('VDD', 'GND')]
     return portinputs
 
 def graboutputs(filename):
-    result = []
-    with open(filename+".cmos", 'r') as file:
-        for line in file:
-            stripped = line.strip()
-            if stripped:
-                result.append(stripped.split())
-    result.sort(key=lambda x: x[0])
+    result = read_netlist(filename)
     port = list(filter(lambda x: x[0] == 'PORT', result))
     portoutputs = [x[2] for x in port if x[1] == 'OUT']
     return portoutputs
 
-def simulate_circuit(filename, inputs):
-    result = []
+def compile_circuit(filename):
+    # reuse the sorted order while the netlist and its subcells are unchanged
+    path = filename+".cmos"
+    cached = _compiled_cache.get(path)
+    if cached is not None:
+        try:
+            if all(file_stamp(dep) == stamp for dep, stamp in cached[1].items()):
+                return cached[0]
+        except OSError:
+            pass
 
-    with open(filename+".cmos", 'r') as file:
-        for line in file:
-            stripped = line.strip()
-            if stripped:
-                result.append(stripped.split())
-    result.sort(key=lambda x: x[0])
+    deps = {path: file_stamp(path)}
+    result = read_netlist(filename)
 
     # seperate io ports and wires
     port = list(filter(lambda x: x[0] == 'PORT', result))
@@ -45,25 +60,56 @@ def simulate_circuit(filename, inputs):
     queue = [x for x in result if x[0] == "NMOS" or x[0] == "PMOS" or x[0] == "INST"]
     correct = []
 
+    # compile each subcell once, its deps become ours
+    subcells = {}
+    for each in queue:
+        if each[0] == "INST" and each[1] not in subcells:
+            subcells[each[1]] = compile_circuit("output/"+each[1])
+            deps.update(_compiled_cache["output/"+each[1]+".cmos"][1])
+
     # topological sort to resolve dependencies
+    stalled = 0
     while len(queue) > 0:
+        # a full pass over the queue resolved nothing
+        if stalled >= len(queue):
+            missing = set()
+            for each in queue:
+                if each[0] != "INST":
+                    missing.update(x for x in each[2:4] if x not in wire)
+                else:
+                    numinputs = len(subcells[each[1]][0])
+                    missing.update(x for x in each[3:3+numinputs] if x not in wire)
+            raise ValueError(f"{path}: unresolved nets {', '.join(sorted(missing))}")
+
         if queue[0][0] != "INST":
             if queue[0][2] in wire and queue[0][3] in wire:
                 wire.append(queue[0][4])
-                correct.append(queue[0])
+                correct.append((queue[0], None))
                 queue.pop(0)
+                stalled = 0
             else:
                 queue.append(queue.pop(0))
+                stalled += 1
         else:
-            instinputs = len(grabinputs("output/"+queue[0][1]))
-            instoutputs = len(graboutputs("output/"+queue[0][1]))
+            sub = subcells[queue[0][1]]
+            instinputs = len(sub[0])
+            instoutputs = len(sub[1])
             if all(queue[0][i+3] in wire for i in range(instinputs)):
                 for i in range(instoutputs):
                     wire.append(queue[0][i+3+instinputs])
-                correct.append(queue[0])
+                correct.append((queue[0], sub))
                 queue.pop(0)
+                stalled = 0
             else:
                 queue.append(queue.pop(0))
+                stalled += 1
+
+    compiled = (portinputs, portoutputs, wire, correct)
+    _compiled_cache[path] = (compiled, deps)
+    return compiled
+
+def run_circuit(compiled, inputs):
+    portinputs, portoutputs, wire, correct = compiled
 
     # init wires
     simulatedinputs = {each: 0 for each in wire}
@@ -76,24 +122,24 @@ def simulate_circuit(filename, inputs):
             simulatedinputs[pin] = inputs[pin]
 
     # simulate circuit
-    for each in correct:
+    for each, sub in correct:
         if each[0] == "NMOS" and simulatedinputs[each[2]] == 1:
             simulatedinputs[each[4]] = simulatedinputs[each[3]]
         if each[0] == "PMOS" and simulatedinputs[each[2]] == 0:
             simulatedinputs[each[4]] = simulatedinputs[each[3]]
         if each[0] == "INST":
-            numinputs = len(grabinputs("output/"+each[1]))
-            outputs = len(graboutputs("output/"+each[1]))
+            # get the input names for this instance
+            sub_inputs = sub[0]
+            numinputs = len(sub_inputs)
+            outputs = len(sub[1])
             input_values = {}
 
-            # get the input names for this instance
-            sub_inputs = grabinputs("output/"+each[1])
             # map the instance inputs to the actual values
             for i in range(numinputs):
                 input_values[sub_inputs[i]] = simulatedinputs[each[i+3]]
 
             # recursively simulate the subcircuit
-            simulatedoutputs = simulate_circuit("output/"+each[1], input_values)
+            simulatedoutputs = run_circuit(sub, input_values)
 
             # set the outputs
             for i in range(outputs):
@@ -102,6 +148,19 @@ def simulate_circuit(filename, inputs):
     # return output values
     return [simulatedinputs[pin] for pin in portoutputs]
 
+def simulate_circuit(filename, inputs):
+    return run_circuit(compile_circuit(filename), inputs)
+
+def truth_table(filename):
+    compiled = compile_circuit(filename)
+    portinputs = compiled[0]
+    rows = []
+    for values in product([0, 1], repeat=len(portinputs)):
+        input_dict = {pin: val for pin, val in zip(portinputs, values)}
+        output_values = run_circuit(compiled, input_dict)
+        rows.append(list(values) + output_values)
+    return rows
+
 def readfile(filename, generateTruth):
     # get port information
     portinputs = grabinputs(filename)
@@ -116,10 +175,8 @@ def readfile(filename, generateTruth):
         if len(portinputs) > 6:
             print("error: too many inputs to generate truth table")
         else:
-            for values in product([0, 1], repeat=len(portinputs)):
-                input_dict = {pin: val for pin, val in zip(portinputs, values)}
-                output_values = simulate_circuit(filename, input_dict)
-                print(" ".join(map(str, values + tuple(output_values))))
+            for row in truth_table(filename):
+                print(" ".join(map(str, row)))
     else:
         # get single input case from user
         while True: